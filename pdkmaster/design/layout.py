@@ -11,14 +11,16 @@ Internally the klayout API is used to represent the shapes and perform manipulat
 on them.
 """
 import abc, logging
+from collections import defaultdict, OrderedDict
 from itertools import product
 from pdkmaster.typing import IntFloat, SingleOrMulti
 from typing import (
-    Any, Iterable, Generator, Sequence, Mapping, Tuple, Optional, Union, Type, cast,
+    Any, Dict, List, Iterable, Generator, Sequence, Mapping, Tuple, Optional, Union,
+    Type, cast,
+)
+from shapely import (
+    geometry as sh_geo, ops as sh_ops, affinity as sh_aff, prepared as sh_prep,
 )
-from matplotlib import pyplot as plt
-import descartes
-from shapely import geometry as sh_geo, ops as sh_ops, affinity as sh_aff
 
 from .. import _util
 from ..technology import (
@@ -38,6 +40,10 @@ __all__ = [
 _rotations = (
     "no", "90", "180", "270", "mirrorx", "mirrorx&90", "mirrory", "mirrory&90",
 )
+_rotationset = frozenset(_rotations)
+# Shared empty polygon; shapely geometries are not modified in place so the
+# same object can be used everywhere an empty result is needed.
+_empty_polygon = sh_geo.Polygon()
 
 
 class NetOverlapError(Exception):
@@ -67,6 +73,12 @@ def _rect(
     )
 
 
+def _enclosure_xy(enclosure: prp.Enclosure) -> Tuple[float, float]:
+    """Return the enclosure as a (x, y) pair"""
+    spec = enclosure.spec
+    return (spec, spec) if isinstance(spec, float) else (spec[0], spec[1])
+
+
 def _via_array(
     left: float, bottom: float, width: float, pitch: float, rows: int, columns: int,
 ):
@@ -139,11 +151,11 @@ def _manhattan_polygon(polygon, *, outer=True):
             yield coord
             prev = coord
 
-    if _util.is_iterable(polygon):
-        return sh_ops.unary_union(tuple(
+    if isinstance(polygon, sh_geo.MultiPolygon):
+        return sh_ops.unary_union([
             _manhattan_polygon(subpolygon, outer=outer)
-            for subpolygon in polygon
-        ))
+            for subpolygon in polygon.geoms
+        ])
     else:
         return sh_geo.Polygon(
             shell=_manhattan_coords(tuple(polygon.exterior.coords), outer),
@@ -154,14 +166,121 @@ def _manhattan_polygon(polygon, *, outer=True):
         )
 
 
+def _is_manhattan(polygon) -> bool:
+    def _manhattan_ring(coords) -> bool:
+        return all(
+            (coord[0] == next_coord[0]) or (coord[1] == next_coord[1])
+            for coord, next_coord in zip(coords[:-1], coords[1:])
+        )
+
+    if isinstance(polygon, sh_geo.MultiPolygon):
+        return all(_is_manhattan(subpolygon) for subpolygon in polygon.geoms)
+    else:
+        return (
+            _manhattan_ring(tuple(polygon.exterior.coords))
+            and all(
+                _manhattan_ring(tuple(interior.coords))
+                for interior in polygon.interiors
+            )
+        )
+
+
+def _is_rectangle(polygon) -> bool:
+    return (
+        isinstance(polygon, sh_geo.Polygon)
+        and (len(polygon.interiors) == 0)
+        and (len(polygon.exterior.coords) == 5)
+        and _is_manhattan(polygon)
+    )
+
+
+def _grown_polygon(polygon, size):
+    if _is_rectangle(polygon):
+        # A rectangle; grow the bounds directly without a buffer operation
+        left, bottom, right, top = polygon.bounds
+        left -= size
+        bottom -= size
+        right += size
+        top += size
+        if (left >= right) or (bottom >= top):
+            return _empty_polygon
+        return sh_geo.box(left, bottom, right, top)
+    # For a Manhattan polygon a buffer with mitred joins is Manhattan itself so
+    # the polygon does not need to be converted coordinate by coordinate.
+    elif _is_manhattan(polygon):
+        return polygon.buffer(size, join_style=sh_geo.JOIN_STYLE.mitre)
+    else:
+        return _manhattan_polygon(polygon.buffer(size, resolution=0), outer=True)
+
+
+def _connected_polygon(polygon):
+    if _is_rectangle(polygon):
+        # Already convex and Manhattan
+        return polygon
+    # The convex hull of a rectangle is the rectangle itself; only convert
+    # the hull if it actually has non-Manhattan edges.
+    hull = polygon.convex_hull
+    if _is_manhattan(hull):
+        return hull
+    # Simplify only when needed to remove rounding noise from the polygon.
+    hull = polygon.simplify(1e-6).convex_hull
+    if _is_manhattan(hull):
+        return hull
+    else:
+        return _manhattan_polygon(hull, outer=False)
+
+
+# Helper functions for the shapely boolean operations that avoid the GEOS call
+# when one of the operands is empty.
+def _union(polygon1, polygon2):
+    if polygon2.is_empty:
+        return polygon1
+    elif polygon1.is_empty:
+        return polygon2
+    else:
+        return polygon1.union(polygon2)
+
+
+def _difference(polygon1, polygon2):
+    if polygon1.is_empty or polygon2.is_empty:
+        return polygon1
+    else:
+        return polygon1.difference(polygon2)
+
+
+def _bounds_disjoint(polygon1, polygon2):
+    # Empty polygons don't intersect anything; their bounds are also not usable
+    # as shapely 1.x returns an empty tuple for them.
+    if polygon1.is_empty or polygon2.is_empty:
+        return True
+    left1, bottom1, right1, top1 = polygon1.bounds
+    left2, bottom2, right2, top2 = polygon2.bounds
+    return (
+        (left1 > right2) or (left2 > right1)
+        or (bottom1 > top2) or (bottom2 > top1)
+    )
+
+
+def _intersection(polygon1, polygon2):
+    if polygon1.is_empty:
+        return polygon1
+    elif polygon2.is_empty:
+        return polygon2
+    elif _bounds_disjoint(polygon1, polygon2):
+        return _empty_polygon
+    else:
+        return polygon1.intersection(polygon2)
+
+
 class MaskPolygon:
+    __slots__ = ("mask", "polygon")
+
     _geometry_types = (sh_geo.Polygon, sh_geo.MultiPolygon)
     _geometry_types_str = "'Polygon'/'MultiPolygon' from shapely"
 
     def __init__(self, mask, polygon):
         if not isinstance(mask, msk.DesignMask):
             raise TypeError("mask has to be of type 'DesignMask'")
-        self.name = mask.name
         self.mask = mask
 
         if isinstance(polygon, geo.Rect):
@@ -178,8 +297,22 @@ class MaskPolygon:
             )
         self.polygon = polygon
 
+    @classmethod
+    def _from_valid(cls, mask: msk.DesignMask, polygon) -> "MaskPolygon":
+        # Create MaskPolygon without type checking; only to be used with mask
+        # and polygon that are known to be valid, e.g. derived from an existing
+        # MaskPolygon.
+        mp = cls.__new__(cls)
+        mp.mask = mask
+        mp.polygon = polygon
+        return mp
+
+    @property
+    def name(self) -> str:
+        return self.mask.name
+
     def dup(self):
-        return MaskPolygon(self.mask, self.polygon)
+        return MaskPolygon._from_valid(self.mask, self.polygon)
 
     @property
     def bounds(self) -> geo.Rect:
@@ -192,22 +325,22 @@ class MaskPolygon:
         if isinstance(self.polygon, sh_geo.Polygon):
             yield self
         elif isinstance(self.polygon, sh_geo.MultiPolygon):
-            for polygon in self.polygon: # type: ignore
-                yield MaskPolygon(self.mask, polygon)
+            for polygon in self.polygon.geoms:
+                yield MaskPolygon._from_valid(self.mask, polygon)
         else:
             raise AssertionError("Internal error")
 
     def __iadd__(self, polygon):
         if isinstance(polygon, MaskPolygon):
             if self.mask == polygon.mask:
-                self.polygon = self.polygon.union(polygon.polygon)
+                self.polygon = _union(self.polygon, polygon.polygon)
                 return self
             else:
                 return self + polygon
         elif isinstance(polygon, MaskPolygons):
             return polygon + self
         elif isinstance(polygon, self._geometry_types):
-            self.polygon = self.polygon.union(polygon)
+            self.polygon = _union(self.polygon, polygon)
             return self
         else:
             raise TypeError(
@@ -216,58 +349,47 @@ class MaskPolygon:
             )
     __ior__ = __iadd__
 
-    def __isub__(self, polygon):
+    def _operand_polygon(self, polygon, operation: str):
+        # Return the shapely geometry of the operand on the mask of this polygon
+        # or None if the operand has nothing on that mask.
         if isinstance(polygon, MaskPolygon):
-            if self.mask == polygon.mask:
-                self.polygon = self.polygon.difference(polygon.polygon)
+            return polygon.polygon if self.mask == polygon.mask else None
         elif isinstance(polygon, MaskPolygons):
-            try:
-                polygon = polygon[self.mask]
-            except:
-                pass
-            else:
-                self.polygon = self.polygon.difference(polygon.polygon)
+            polygon = polygon._map_.get(self.mask)
+            return None if polygon is None else polygon.polygon
         elif isinstance(polygon, self._geometry_types):
-            self.polygon = self.polygon.difference(polygon)
+            return polygon
         else:
             raise TypeError(
-                "can only add object of type 'MaskPolygon', 'Maskpolygons' or \n"
+                f"can only {operation} object of type 'MaskPolygon', 'Maskpolygons' or \n"
                 f"{self._geometry_types_str}"
             )
+
+    def __isub__(self, polygon):
+        other = self._operand_polygon(polygon, "subtract")
+        if other is not None:
+            self.polygon = _difference(self.polygon, other)
         return self
 
     def __iand__(self, polygon):
-        if isinstance(polygon, MaskPolygon):
-            if self.mask == polygon.mask:
-                self.polygon = self.polygon.intersection(polygon.polygon)
-            else:
-                self.polygon = sh_geo.Polygon()
-        elif isinstance(polygon, MaskPolygons):
-            try:
-                polygon = polygon[self.mask]
-            except:
-                self.polygon = sh_geo.Polygon()
-            else:
-                self.polygon = self.polygon.intersection(polygon.polygon)
-        elif isinstance(polygon, self._geometry_types):
-            self.polygon = self.polygon.intersection(polygon)
+        other = self._operand_polygon(polygon, "intersect")
+        if other is None:
+            self.polygon = _empty_polygon
         else:
-            raise TypeError(
-                "can only intersect object of type 'MaskPolygon', 'Maskpolygons' or \n"
-                f"{self._geometry_types_str}"
-            )
+            self.polygon = _intersection(self.polygon, other)
+        return self
     __imul__ = __iand__
 
     def __add__(self, polygon):
         if isinstance(polygon, MaskPolygon):
             if self.mask == polygon.mask:
-                return MaskPolygon(self.mask, self.polygon.union(polygon.polygon))
+                return MaskPolygon(self.mask, _union(self.polygon, polygon.polygon))
             else:
                 return MaskPolygons((self, polygon))
         elif isinstance(polygon, MaskPolygons):
             return polygon + self
         elif isinstance(polygon, self._geometry_types):
-            return MaskPolygon(self.mask, self.polygon.union(polygon))
+            return MaskPolygon(self.mask, _union(self.polygon, polygon))
         else:
             raise TypeError(
                 "can only add object of type 'MaskPolygon', 'Maskpolygons' or \n"
@@ -276,48 +398,20 @@ class MaskPolygon:
     __or__ = __add__
 
     def __sub__(self, polygon):
-        if isinstance(polygon, MaskPolygon):
-            if self.mask == polygon.mask:
-                newpolygon = self.polygon.difference(polygon.polygon)
-            else:
-                newpolygon = self.polygon
-        elif isinstance(polygon, MaskPolygons):
-            try:
-                polygon = polygon[self.mask]
-            except:
-                newpolygon = self.polygon
-            else:
-                newpolygon = self.polygon.difference(polygon.polygon)
-        elif isinstance(polygon, self._geometry_types):
-            newpolygon = self.polygon.difference(polygon)
+        other = self._operand_polygon(polygon, "subtract")
+        if other is None:
+            newpolygon = self.polygon
         else:
-            raise TypeError(
-                "can only add object of type 'MaskPolygon', 'Maskpolygons' or \n"
-                f"{self._geometry_types_str}"
-            )
+            newpolygon = _difference(self.polygon, other)
 
         return MaskPolygon(self.mask, newpolygon)
 
     def __and__(self, polygon):
-        if isinstance(polygon, MaskPolygon):
-            if self.mask == polygon.mask:
-                newpolygon = self.polygon.intersection(polygon.polygon)
-            else:
-                newpolygon = sh_geo.Polygon()
-        elif isinstance(polygon, MaskPolygons):
-            try:
-                polygon = polygon[self.mask]
-            except:
-                newpolygon = sh_geo.Polygon()
-            else:
-                newpolygon = self.polygon.intersection(polygon.polygon)
-        elif isinstance(polygon, self._geometry_types):
-            newpolygon = self.polygon.intersection(polygon)
+        other = self._operand_polygon(polygon, "intersect")
+        if other is None:
+            newpolygon = _empty_polygon
         else:
-            raise TypeError(
-                "can only add object of type 'MaskPolygon', 'Maskpolygons' or \n"
-                f"{self._geometry_types_str}"
-            )
+            newpolygon = _intersection(self.polygon, other)
 
         return MaskPolygon(self.mask, newpolygon)
     __mul__ = __and__
@@ -329,6 +423,7 @@ class MaskPolygon:
             )
         return (
             (self.mask == other.mask)
+            and not _bounds_disjoint(self.polygon, other.polygon)
             and self.polygon.intersects(other.polygon)
         )
 
@@ -368,34 +463,24 @@ class MaskPolygon:
         assert isinstance(self.polygon, MaskPolygon._geometry_types)
 
     def moved(self, dx, dy, rotation="no"):
-        return MaskPolygon(self.mask, self._move_polygon(dx, dy, rotation))
+        return MaskPolygon._from_valid(
+            self.mask, self._move_polygon(dx, dy, rotation),
+        )
 
     def grow(self, size):
-        self.polygon = _manhattan_polygon(
-            self.polygon.buffer(size, resolution=0), outer=True,
-        )
+        self.polygon = _grown_polygon(self.polygon, size)
 
     def grown(self, size):
-        return MaskPolygon(
-            self.mask, _manhattan_polygon(
-                self.polygon.buffer(size, resolution=0), outer=True,
-            ),
-        )
+        return MaskPolygon._from_valid(self.mask, _grown_polygon(self.polygon, size))
 
     def connect(self):
         try:
-            self.polygon = _manhattan_polygon(
-                self.polygon.simplify(1e-6).convex_hull, outer=False,
-            )
+            self.polygon = _connected_polygon(self.polygon)
         except:
             logging.warning(f"Polygon.connect() failed for '{self}'")
 
     def connected(self):
-        return MaskPolygon(
-            self.mask, _manhattan_polygon(
-                self.polygon.simplify(1e-6).convex_hull, outer=False,
-            ),
-        )
+        return MaskPolygon(self.mask, _connected_polygon(self.polygon))
 
 
 class MaskPolygons(_util.TypedListMapping[MaskPolygon, msk.DesignMask]):
@@ -403,6 +488,11 @@ class MaskPolygons(_util.TypedListMapping[MaskPolygon, msk.DesignMask]):
     _index_attribute_ = "mask"
     _index_type_ = msk.DesignMask
 
+    def __init__(self, iterable=tuple()):
+        super().__init__(iterable)
+        # Cache for looking up polygons by mask name; see __getattr__
+        self._namemap_: Dict[str, MaskPolygon] = {}
+
     def dup(self):
         return MaskPolygons(mp.dup() for mp in self)
 
@@ -419,31 +509,53 @@ class MaskPolygons(_util.TypedListMapping[MaskPolygon, msk.DesignMask]):
         )
 
     def __getattr__(self, name: str):
-        for elem in self._t:
-            if elem.mask.name == name:
-                return elem
-        raise AttributeError(f"No polygon for mask named '{name}'")
+        # Private attributes are never mask names; this also avoids infinite
+        # recursion when __getattr__ is called before _map_ is set.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        # A cached element is only valid if it is still the polygon for its
+        # mask; otherwise the cache is rebuilt from the mask index.
+        elem = self._namemap_.get(name)
+        if (elem is None) or (self._map_.get(elem.mask) is not elem):
+            self._namemap_ = {mask.name: elem for mask, elem in self._map_.items()}
+            try:
+                elem = self._namemap_[name]
+            except KeyError:
+                raise AttributeError(f"No polygon for mask named '{name}'")
+        return elem
 
     def __iadd__(self, other):
         if self._frozen_:
             raise ValueError("Can't add layout to a frozen 'MaskPolygons' object")
-        if not isinstance(other, MaskPolygons):
-            other = tuple(other) if _util.is_iterable(other) else (other,)
-            if not all(isinstance(polygons, MaskPolygon) for polygons in other):
+        # Elements of a MaskPolygons object don't need to be checked
+        check = not isinstance(other, MaskPolygons)
+        if check and not _util.is_iterable(other):
+            other = (other,)
+
+        # Join polygons on the same mask; all polygons for one mask are merged
+        # with a single union.
+        maskpolygons: Dict[msk.DesignMask, List[MaskPolygon]] = defaultdict(list)
+        for polygon in other:
+            if check and not isinstance(polygon, MaskPolygon):
                 raise TypeError(
                     "Element to add to object of type 'MaskPolygons' has to be of type\n"
                     "'MaskPolygon', 'MaskPolygons' or an iterable of 'MaskPolygon'"
                 )
-
-        # Join polygons on the same mask
+            maskpolygons[polygon.mask].append(polygon)
         new = []
-        for polygon in other:
-            try:
-                p2 = self[polygon.mask]
-            except:
-                new.append(polygon)
+        for mask, polygons in maskpolygons.items():
+            p2 = self._map_.get(mask)
+            if p2 is None:
+                if len(polygons) == 1:
+                    new.append(polygons[0])
+                else:
+                    new.append(MaskPolygon(mask, sh_ops.unary_union(tuple(
+                        polygon.polygon for polygon in polygons
+                    ))))
             else:
-                p2 += polygon.polygon
+                p2.polygon = sh_ops.unary_union((
+                    p2.polygon, *(polygon.polygon for polygon in polygons),
+                ))
         super().__iadd__(new)
 
         return self
@@ -452,19 +564,12 @@ class MaskPolygons(_util.TypedListMapping[MaskPolygon, msk.DesignMask]):
         if self._frozen_:
             raise ValueError("Can't subtract from a frozen 'MaskPolygons' object")
         if isinstance(other, MaskPolygons):
-            for polygon in self:
-                try:
-                    polygon2 = other[polygon.mask]
-                except:
-                    pass
-                else:
-                    polygon -= polygon2
+            # Only masks present in both objects need a difference
+            for polygon, polygon2 in _mask_pairs(self, other):
+                polygon -= polygon2
         elif isinstance(other, MaskPolygon):
-            try:
-                polygon = self[other.mask]
-            except:
-                pass
-            else:
+            polygon = self._map_.get(other.mask)
+            if polygon is not None:
                 polygon -= other
         else:
             raise TypeError(
@@ -484,7 +589,27 @@ class MaskPolygons(_util.TypedListMapping[MaskPolygon, msk.DesignMask]):
         return newpolygons
 
 
+def _mask_pairs(polygons1: MaskPolygons, polygons2: MaskPolygons) -> Generator[
+    Tuple[MaskPolygon, MaskPolygon], None, None,
+]:
+    """Generate the pairs of polygons on the same mask from two MaskPolygons
+    objects. The smaller object is iterated over and the mask is looked up in
+    the other one."""
+    if len(polygons1) <= len(polygons2):
+        for polygon1 in polygons1:
+            polygon2 = polygons2._map_.get(polygon1.mask)
+            if polygon2 is not None:
+                yield (polygon1, polygon2)
+    else:
+        for polygon2 in polygons2:
+            polygon1 = polygons1._map_.get(polygon2.mask)
+            if polygon1 is not None:
+                yield (polygon1, polygon2)
+
+
 class _SubLayout(abc.ABC):
+    __slots__ = ("polygons",)
+
     @abc.abstractmethod
     def __init__(self, polygons):
         assert isinstance(polygons, MaskPolygons), "Internal error"
@@ -522,6 +647,8 @@ class _SubLayout(abc.ABC):
 
 
 class NetSubLayout(_SubLayout):
+    __slots__ = ("net",)
+
     def __init__(self, net: net_.Net, polygons: Union[
         MaskPolygon, MaskPolygons,
     ]):
@@ -560,26 +687,20 @@ class NetSubLayout(_SubLayout):
         if isinstance(other, MultiNetSubLayout):
             return other.overlaps_with(self, hierarchical=hierarchical)
 
-        self_polygons = dict((p.mask, p) for p in self.polygons)
-        self_masks = set(self_polygons.keys())
-        other_polygons = dict((p.mask, p) for p in other.polygons)
-        other_masks = set(other_polygons.keys())
-        common_masks = self_masks.intersection(other_masks)
-
         same_net = (not isinstance(other, NetlessSubLayout)) and (self.net == other.net)
-        for mask in common_masks:
-            if self_polygons[mask].overlaps_with(other_polygons[mask]):
+        for self_polygon, other_polygon in _mask_pairs(self.polygons, other.polygons):
+            if self_polygon.overlaps_with(other_polygon):
                 if same_net:
                     return True
                 else:
                     try:
                         net = cast(NetSubLayout, other).net
-                    except:
+                    except AttributeError:
                         othernet = "None"
                     else:
                         othernet = net.name
                     raise NetOverlapError(
-                        f"Overlapping polygons for mask {mask.name} "
+                        f"Overlapping polygons for mask {self_polygon.mask.name} "
                         f"on net '{self.net.name}' and net '{othernet}'"
                     )
         else:
@@ -593,6 +714,8 @@ class NetSubLayout(_SubLayout):
 
 
 class NetlessSubLayout(_SubLayout):
+    __slots__ = ()
+
     def __init__(self, polygons):
         if isinstance(polygons, MaskPolygon):
             polygons = MaskPolygons(polygons)
@@ -625,13 +748,8 @@ class NetlessSubLayout(_SubLayout):
 
         assert isinstance(other, NetlessSubLayout), "Internal error"
 
-        self_polygons = dict((p.mask, p) for p in self.polygons)
-        self_masks = set(self_polygons.keys())
-        other_polygons = dict((p.mask, p) for p in other.polygons)
-        other_masks = set(other_polygons.keys())
-        common_masks = self_masks.intersection(other_masks)
-        for mask in common_masks:
-            if self_polygons[mask].overlaps_with(other_polygons[mask]):
+        for self_polygon, other_polygon in _mask_pairs(self.polygons, other.polygons):
+            if self_polygon.overlaps_with(other_polygon):
                 return True
         else:
             return False
@@ -644,6 +762,8 @@ class NetlessSubLayout(_SubLayout):
 
 
 class MultiNetSubLayout(_SubLayout):
+    __slots__ = ("sublayouts",)
+
     def __init__(self, sublayouts: Iterable[Union[NetSubLayout, NetlessSubLayout]]):
         self.sublayouts = tuple(sublayouts)
 
@@ -663,29 +783,23 @@ class MultiNetSubLayout(_SubLayout):
             sl.moved(dx, dy, rotation) for sl in self.sublayouts
         ))
 
-    @property
-    def _netmasks(self):
-        for netlayout in self.sublayouts:
-            for polygon in netlayout.polygons:
-                yield polygon.mask
-
-    @property
-    def _netpolygons(self):
+    def _update_maskpolygon(self):
+        # Collect masks, polygons and total area of the sublayouts in one pass
+        netmasks = set()
+        netpolygons = []
+        area = 0.0
         for netlayout in self.sublayouts:
             for polygon in netlayout.polygons:
-                yield polygon.polygon
-
-    def _update_maskpolygon(self):
-        netmasks = set(self._netmasks)
+                netmasks.add(polygon.mask)
+                netpolygons.append(polygon.polygon)
+                area += polygon.polygon.area
         if len(netmasks) != 1:
             raise ValueError(
                 "all layouts in sublayouts have to be on the same mask"
             )
         netmask = netmasks.pop()
 
-        netpolygons = tuple(self._netpolygons)
         maskpolygon = MaskPolygon(netmask, sh_ops.unary_union(netpolygons))
-        area = sum(polygon.area for polygon in netpolygons)
         if not all((
             isinstance(maskpolygon.polygon, sh_geo.Polygon),
             abs(area - maskpolygon.polygon.area)/area < 1e-4,
@@ -699,43 +813,51 @@ class MultiNetSubLayout(_SubLayout):
         if not isinstance(other, _SubLayout):
             raise TypeError("Can only add object of type '_SubLayout'")
 
-        assert len(self.polygons) == 1, "Internal error"
-        self_polygon = self.polygons[0]
-
         if isinstance(other, (NetSubLayout, NetlessSubLayout)):
-            if len(other.polygons) != 1:
-                raise ValueError(
-                    "Can only add single polygon sublayout to 'MultiNetSubLayout'"
-                )
-            else:
-                other_polygon = other.polygons[0]
-                if self_polygon.mask != other_polygon.mask:
-                    raise ValueError(
-                        f"Polygon on mask {other_polygon.mask.name} can't be added to\n"
-                        f"'MultiNetSubLayout' polygon on mask {self_polygon.mask.name}"
-                    )
-                for self_sublayout in self.sublayouts:
-                    if self_sublayout.overlaps_with(other, hierarchical=False):
-                        self_sublayout += other
-                        self._update_maskpolygon()
-                        break
-                else:
-                    raise ValueError(
-                        "Can only add overlapping polygon to 'MultiNetSubLayout'"
-                    )
+            self._add_sublayout(other)
+            self._update_maskpolygon()
         else:
             assert isinstance(other, MultiNetSubLayout), "Internal error"
+            # Build the new sublayouts in a list and only convert back to a tuple
+            # at the end.
+            sublayouts = list(self.sublayouts)
             for other_sublayout in other.sublayouts:
-                for self_sublayout in self.sublayouts:
+                for self_sublayout in sublayouts:
                     if other_sublayout.overlaps_with(self_sublayout, hierarchical=False):
                         self_sublayout += other_sublayout
                         break
                 else:
-                    self.sublayouts += (other_sublayout,)
+                    sublayouts.append(other_sublayout)
+            self.sublayouts = tuple(sublayouts)
             self._update_maskpolygon()
 
         return self
 
+    def _add_sublayout(self, other: Union[NetSubLayout, NetlessSubLayout]):
+        # Add single polygon sublayout to the overlapping sublayout; the caller
+        # has to call _update_maskpolygon() afterwards.
+        assert len(self.polygons) == 1, "Internal error"
+        self_polygon = self.polygons[0]
+
+        if len(other.polygons) != 1:
+            raise ValueError(
+                "Can only add single polygon sublayout to 'MultiNetSubLayout'"
+            )
+        other_polygon = other.polygons[0]
+        if self_polygon.mask != other_polygon.mask:
+            raise ValueError(
+                f"Polygon on mask {other_polygon.mask.name} can't be added to\n"
+                f"'MultiNetSubLayout' polygon on mask {self_polygon.mask.name}"
+            )
+        for self_sublayout in self.sublayouts:
+            if self_sublayout.overlaps_with(other, hierarchical=False):
+                self_sublayout += other
+                break
+        else:
+            raise ValueError(
+                "Can only add overlapping polygon to 'MultiNetSubLayout'"
+            )
+
     def merge_from(self, other):
         """Extract overlapping polygon from other and add it to itself
 
@@ -749,11 +871,13 @@ class MultiNetSubLayout(_SubLayout):
         else:
             assert len(self.polygons) == 1
 
+            # The joined polygon is only updated once after all polygons are
+            # added.
             def add_polygon(self, other_polygon):
                 if isinstance(other, NetSubLayout):
-                    self += NetSubLayout(other.net, other_polygon)
+                    self._add_sublayout(NetSubLayout(other.net, other_polygon))
                 elif isinstance(other, NetlessSubLayout):
-                    self += NetlessSubLayout(other_polygon)
+                    self._add_sublayout(NetlessSubLayout(other_polygon))
                 else:
                     raise AssertionError("Internal error")
 
@@ -764,16 +888,22 @@ class MultiNetSubLayout(_SubLayout):
                 other.polygons.pop(self_polygon.mask)
             elif isinstance(other_polygon.polygon, sh_geo.MultiPolygon):
                 # Take only parts of other polygon that overlap with out polygon
-                for p2 in filter(
-                    lambda p: self_polygon.polygon.intersects(p),
-                    other_polygon.polygon,
-                ):
+                prepared = sh_prep.prep(self_polygon.polygon)
+                parts = tuple(filter(
+                    lambda p: prepared.intersects(p),
+                    other_polygon.polygon.geoms,
+                ))
+                for p2 in parts:
                     add_polygon(self, MaskPolygon(other_polygon.mask, p2))
-                    other_polygon.polygon = other_polygon.polygon.difference(p2)
-                if not other_polygon.polygon:
+                # Remove all taken parts with one difference operation
+                other_polygon.polygon = _difference(
+                    other_polygon.polygon, sh_ops.unary_union(parts),
+                )
+                if other_polygon.polygon.is_empty:
                     other.polygons.pop(self_polygon.mask)
             else:
                 raise AssertionError("Internal error")
+            self._update_maskpolygon()
 
             return not other.polygons
 
@@ -816,6 +946,8 @@ class MaskShapesSubLayout(_SubLayout):
             `None` value represents no net for the shapes.
         shapes: The maskshapes on the net.
     """
+    __slots__ = ("_net", "_shapes")
+
     def __init__(self, *, net: Optional[net_.Net], shapes: geo.MaskShapes):
         self._net = net
         self._shapes = shapes
@@ -868,12 +1000,14 @@ class MaskShapesSubLayout(_SubLayout):
 
 
 class _InstanceSubLayout(_SubLayout):
+    __slots__ = ("inst", "x", "y", "rotation", "layoutname", "_layout")
+
     def __init__(self, inst, *, x, y, layoutname, rotation):
         assert (
             isinstance(inst, ckt._CellInstance)
             and isinstance (x, float) and isinstance(y, float)
             and ((layoutname is None) or isinstance(layoutname, str))
-            and (rotation in _rotations)
+            and (rotation in _rotationset)
         ), "Internal error"
         self.inst = inst
         self.x = x
@@ -885,7 +1019,7 @@ class _InstanceSubLayout(_SubLayout):
             try:
                 # Create default layout
                 l = cell.layout
-            except:
+            except (ValueError, NotImplementedError):
                 raise ValueError(
                     f"Cell '{cell.name}' has no default layout and no layoutname"
                     " was specified"
@@ -1138,6 +1272,8 @@ class SubLayouts(_util.TypedList[_SubLayout]):
 
 
 class _Layout:
+    __slots__ = ("fab", "sublayouts", "boundary")
+
     def __init__(self, fab, sublayouts):
         assert (
             isinstance(fab, LayoutFactory)
@@ -1291,7 +1427,7 @@ class _Layout:
                 f"prim '{prim.name}' is not a primitive of technology"
                 f" '{self.fab.tech.name}'"
             )
-        if rotation not in _rotations:
+        if rotation not in _rotationset:
             raise ValueError(
                 f"rotation '{rotation}' is not one of {_rotations}"
             )
@@ -1331,6 +1467,66 @@ class _Layout:
                 l.add_shape(net=net, prim=pin, shape=shape)
             return l
 
+    def add_wires(self, *,
+        nets: Sequence[net_.Net], wire: prm._Conductor,
+        xs: Optional[Sequence[float]]=None, ys: Optional[Sequence[float]]=None,
+        **wire_params,
+    ) -> Tuple["_Layout", ...]:
+        """Add the same wire multiple times, each time on another net.
+
+        The layout for the wire is only generated once and then moved to the
+        different locations.
+
+        Arguments:
+            nets: the net for each of the wires
+            wire: the wire primitive
+            xs, ys: the x and y coordinate of each of the wires.
+                Default is 0.0 for all the wires.
+            wire_params: the parameters for the wire primitive; the location
+                is given by xs and ys so x and y are not allowed. Contrary to
+                add_wire() no shape argument is supported.
+
+        Returns:
+            The layout of each of the added wires
+        """
+        for param in ("x", "y", "shape"):
+            if param in wire_params:
+                raise TypeError(
+                    f"add_wires() got unexpected keyword argument '{param}'"
+                )
+        nets = tuple(nets)
+        n = len(nets)
+        xs = n*(0.0,) if xs is None else tuple(xs)
+        ys = n*(0.0,) if ys is None else tuple(ys)
+        if (len(xs) != n) or (len(ys) != n):
+            raise ValueError("xs and ys need to have the same length as nets")
+        if not (wire in self.fab.tech.primitives):
+            raise ValueError(
+                f"prim '{wire.name}' is not a primitive of technology"
+                f" '{self.fab.tech.name}'"
+            )
+
+        # Generate the layout on the port net of the wire and put the shapes
+        # on the right net for each of the copies.
+        conn = wire.ports.conn
+        wirelayout = self.fab.new_primitivelayout(
+            wire, portnets={"conn": conn}, **wire_params,
+        )
+        layouts = []
+        for net, x, y in zip(nets, xs, ys):
+            def sublayouts():
+                for sl in wirelayout.sublayouts:
+                    assert isinstance(sl, MaskShapesSubLayout), "Internal error"
+                    yield MaskShapesSubLayout(
+                        net=(net if sl.net == conn else sl.net),
+                        shapes=(sl.shapes + geo.Point(x=x, y=y)),
+                    )
+            l = self.fab.new_layout(sublayouts=SubLayouts(sublayouts()))
+            self += l
+            layouts.append(l)
+
+        return tuple(layouts)
+
     def add_maskshape(self, *, net: Optional[net_.Net]=None, maskshape: geo.MaskShape):
         """Add a geometry MaskShape to a _Layout
         """
@@ -1387,8 +1583,15 @@ class _Layout:
 
 
 class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
+    # Maximum number of MOSFET templates kept; the least recently used one is
+    # dropped when more are generated.
+    _mosfet_templates_maxsize = 1024
+
     def __init__(self, fab: "LayoutFactory"):
         self.fab = fab
+        self._mosfet_templates: OrderedDict[
+            Tuple, Tuple[Tuple[Optional[str], geo.MaskShapes], ...],
+        ] = OrderedDict()
 
     def __call__(self, prim: prm._Primitive, *args, **kwargs) -> _Layout:
         return super().__call__(prim, *args, **kwargs)
@@ -1437,9 +1640,8 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
         height = conductor_params["height"]
         r = geo.Rect.from_size(width=width, height=height)
 
-        try:
-            portnets = conductor_params["portnets"]
-        except KeyError:
+        portnets = conductor_params.get("portnets", None)
+        if portnets is None:
             net = prim.ports.conn
         else:
             net = portnets["conn"]
@@ -1490,9 +1692,8 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
         return layout
 
     def Via(self, prim: prm.Via, **via_params) -> _Layout:
-        try:
-            portnets = via_params["portnets"]
-        except KeyError:
+        portnets = via_params.get("portnets", None)
+        if portnets is None:
             net = prim.ports.net
         else:
             if set(portnets.keys()) != {"conn"}:
@@ -1504,22 +1705,14 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
         if bottom_enc is None:
             idx = prim.bottom.index(bottom)
             bottom_enc = prim.min_bottom_enclosure[idx]
-        if isinstance(bottom_enc.spec, float):
-            bottom_enc_x = bottom_enc_y = bottom_enc.spec
-        else:
-            bottom_enc_x = bottom_enc.spec[0]
-            bottom_enc_y = bottom_enc.spec[1]
+        bottom_enc_x, bottom_enc_y = _enclosure_xy(bottom_enc)
 
         top = via_params["top"]
         top_enc = via_params["top_enclosure"]
         if top_enc is None:
             idx = prim.top.index(top)
             top_enc = prim.min_top_enclosure[idx]
-        if isinstance(top_enc.spec, float):
-            top_enc_x = top_enc_y = top_enc.spec
-        else:
-            top_enc_x = top_enc.spec[0]
-            top_enc_y = top_enc.spec[1]
+        top_enc_x, top_enc_y = _enclosure_xy(top_enc)
 
         width = prim.width
         space = via_params["space"]
@@ -1582,53 +1775,44 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
         layout.add_shape(prim=top, net=net, shape=geo.Rect.from_size(
             width=top_width, height=top_height,
         ))
-        try:
-            impl = via_params["bottom_implant"]
-        except KeyError:
-            impl = None
-        else:
-            if impl is not None:
-                enc = via_params["bottom_implant_enclosure"]
-                assert enc is not None, "Internal error"
-                layout.add_shape(prim=impl, shape=_rect(
-                    bottom_left, bottom_bottom, bottom_right, bottom_top,
-                    enclosure=enc,
-                ))
-        try:
-            well = via_params["bottom_well"]
-        except KeyError:
-            well = None
-        else:
-            if well is not None:
-                well_net = via_params.get("well_net", None)
-                enc = via_params["bottom_well_enclosure"]
-                assert enc is not None, "Internal error"
-                if (impl is not None) and (impl.type_ == well.type_):
-                    if well_net is not None:
-                        if well_net != net:
-                            raise ValueError(
-                                f"Net '{well_net}' for well '{well.name}' of WaferWire"
-                                f" {bottom.name} is different from net '{net.name}''\n"
-                                f"\tbut implant '{impl.name}' is same type as the well"
-                            )
-                    else:
-                        well_net = net
-                elif well_net is None:
-                    raise TypeError(
-                        f"No well_net specified for WaferWire '{bottom.name}' in"
-                        f" well '{well.name}'"
-                    )
-                layout.add_shape(prim=well, net=well_net, shape=_rect(
-                    bottom_left, bottom_bottom, bottom_right, bottom_top,
-                    enclosure=enc,
-                ))
+        impl = via_params.get("bottom_implant", None)
+        if impl is not None:
+            enc = via_params["bottom_implant_enclosure"]
+            assert enc is not None, "Internal error"
+            layout.add_shape(prim=impl, shape=_rect(
+                bottom_left, bottom_bottom, bottom_right, bottom_top,
+                enclosure=enc,
+            ))
+        well = via_params.get("bottom_well", None)
+        if well is not None:
+            well_net = via_params.get("well_net", None)
+            enc = via_params["bottom_well_enclosure"]
+            assert enc is not None, "Internal error"
+            if (impl is not None) and (impl.type_ == well.type_):
+                if well_net is not None:
+                    if well_net != net:
+                        raise ValueError(
+                            f"Net '{well_net}' for well '{well.name}' of WaferWire"
+                            f" {bottom.name} is different from net '{net.name}''\n"
+                            f"\tbut implant '{impl.name}' is same type as the well"
+                        )
+                else:
+                    well_net = net
+            elif well_net is None:
+                raise TypeError(
+                    f"No well_net specified for WaferWire '{bottom.name}' in"
+                    f" well '{well.name}'"
+                )
+            layout.add_shape(prim=well, net=well_net, shape=_rect(
+                bottom_left, bottom_bottom, bottom_right, bottom_top,
+                enclosure=enc,
+            ))
 
         return layout
 
     def Resistor(self, prim: prm.Resistor, **resistor_params) -> _Layout:
-        try:
-            portnets = resistor_params["portnets"]
-        except KeyError:
+        portnets = resistor_params.get("portnets", None)
+        if portnets is None:
             port1 = prim.ports.port1
             port2 = prim.ports.port2
         else:
@@ -1658,10 +1842,10 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
                 raise AssertionError("Internal error")
             else:
                 cont_enc = cont.min_top_enclosure[wire_idx]
-                cont_args = {"top": wire, "x": 0.0, "top_width": res_width}
+                cont_args = {"top": wire, "top_width": res_width}
         else:
             cont_enc = cont.min_bottom_enclosure[wire_idx]
-            cont_args = {"bottom": wire, "x": 0.0, "bottom_width": res_width}
+            cont_args = {"bottom": wire, "bottom_width": res_width}
         cont_y1 = -0.5*res_height - cont_space - 0.5*cont.width
         cont_y2 = -cont_y1
 
@@ -1675,23 +1859,23 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
             layout += self(ind, width=(res_width + 2*ext), height=res_height)
 
         # Draw wire layer
-        mp = geo.MultiPartShape(
+        mp = geo.MultiPartShape.from_floats(
             fullshape=geo.Rect.from_size(
                 width=res_width, height=(res_height + 2*wire_ext),
             ),
             parts = (
-                geo.Rect.from_floats(values=(
+                (
                     -0.5*res_width, -0.5*res_height - wire_ext,
                     0.5*res_width, -0.5*res_height,
-                )),
-                geo.Rect.from_floats(values=(
+                ),
+                (
                     -0.5*res_width, -0.5*res_height,
                     0.5*res_width, 0.5*res_height,
-                )),
-                geo.Rect.from_floats(values=(
+                ),
+                (
                     -0.5*res_width, 0.5*res_height,
                     0.5*res_width, 0.5*res_height + wire_ext,
-                )),
+                ),
             )
         )
         layout.add_shape(prim=wire, net=port1, shape=mp.parts[0])
@@ -1699,14 +1883,15 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
         layout.add_shape(prim=wire, net=port2, shape=mp.parts[2])
 
         # Draw contacts
-        layout.add_wire(net=port1, wire=cont, y=cont_y1, **cont_args)
-        layout.add_wire(net=port2, wire=cont, y=cont_y2, **cont_args)
+        layout.add_wires(
+            nets=(port1, port2), wire=cont, ys=(cont_y1, cont_y2), **cont_args,
+        )
 
         if prim.implant is not None:
             impl = prim.implant
-            try:
-                enc = prim.min_implant_enclosure.max() # type: ignore
-            except AttributeError:
+            if prim.min_implant_enclosure is not None:
+                enc = prim.min_implant_enclosure.max()
+            else:
                 assert isinstance(wire, prm.WaferWire), "Internal error"
                 idx = wire.implant.index(impl)
                 enc = wire.min_implant_enclosure[idx].max()
@@ -1745,8 +1930,10 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
             })
 
         layout = self.fab.new_layout()
-        layout.add_wire(wire=prim.wire, **wirenet_args, **diode_params)
-        wireact_bounds = layout.bounds(mask=prim.wire.mask)
+        # add_wire() returns the layout of the added wire; take the bounds
+        # from it so the full layout does not need to be scanned.
+        wirelayout = layout.add_wire(wire=prim.wire, **wirenet_args, **diode_params)
+        wireact_bounds = wirelayout.bounds(mask=prim.wire.mask)
         act_width = wireact_bounds.right - wireact_bounds.left
         act_height = wireact_bounds.top - wireact_bounds.bottom
 
@@ -1763,68 +1950,104 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
         gate_encs = mos_params["gateimplant_enclosures"]
         sdw = mos_params["sd_width"]
 
+        portnets = cast(
+            Optional[Mapping[str, net_.Net]], mos_params.get("portnets", None),
+        )
+        if portnets is None:
+            portnets = prim.ports
+
+        # The shapes only depend on the dimensions of the transistor and not
+        # on the nets; they are generated only once for each set of dimensions.
+        key = (
+            prim, l, w, sdw,
+            None if impl_enc is None else impl_enc.spec,
+            tuple(None if enc is None else enc.spec for enc in gate_encs),
+        )
         try:
-            portnets = cast(Mapping[str, net_.Net], mos_params["portnets"])
+            template = self._mosfet_templates[key]
         except KeyError:
-            portnets = prim.ports
+            # Join the shapes per port so each port only needs one sublayout
+            portshapes: Dict[Optional[str], geo.MaskShapes] = {}
+            for shape_prim, portname, shape in self._mosfet_template(
+                prim, l=l, w=w, sdw=sdw, impl_enc=impl_enc, gate_encs=gate_encs,
+            ):
+                ms = geo.MaskShape(
+                    mask=cast(msk.DesignMask, shape_prim.mask), shape=shape,
+                )
+                try:
+                    portshapes[portname] += ms
+                except KeyError:
+                    portshapes[portname] = geo.MaskShapes(ms)
+            for shapes in portshapes.values():
+                shapes._freeze_()
+            template = self._mosfet_templates[key] = tuple(portshapes.items())
+            if len(self._mosfet_templates) > self._mosfet_templates_maxsize:
+                self._mosfet_templates.popitem(last=False)
+        else:
+            self._mosfet_templates.move_to_end(key)
 
+        layout = self.fab.new_layout()
+        # Sublayouts are copied when added to the layout so the frozen
+        # template shapes are not modified.
+        for portname, shapes in template:
+            layout.sublayouts += MaskShapesSubLayout(
+                net=(None if portname is None else portnets[portname]),
+                shapes=shapes,
+            )
+
+        return layout
+
+    def _mosfet_template(self, prim: prm.MOSFET, *,
+        l: float, w: float, sdw: float,
+        impl_enc: Optional[prp.Enclosure], gate_encs: Sequence[prp.Enclosure],
+    ) -> Generator[
+        Tuple[prm._DesignMaskPrimitive, Optional[str], geo._Shape], None, None,
+    ]:
+        """Generate the shapes for a MOSFET
+
+        Yields:
+            (prim, portname, shape) tuples; portname is `None` for shapes that
+            are not on a net.
+        """
+        # Coordinates are computed once and shared by all the rectangles
+        # derived from the active and the gate area.
         gate_left = -0.5*l
         gate_right = 0.5*l
-        gate_top = 0.5*w
         gate_bottom = -0.5*w
-
-        layout = self.fab.new_layout()
+        gate_top = 0.5*w
+        gate_coords = (gate_left, gate_bottom, gate_right, gate_top)
 
         active = prim.gate.active
         active_width = l + 2*sdw
         active_left = -0.5*active_width
         active_right = 0.5*active_width
-        active_bottom = gate_bottom
-        active_top = gate_top
+        active_coords = (active_left, gate_bottom, active_right, gate_top)
 
-        mps = geo.MultiPartShape(
-            fullshape=geo.Rect.from_size(width=active_width, height=w),
+        mps = geo.MultiPartShape.from_floats(
+            fullshape=geo.Rect.from_floats(values=active_coords),
             parts=(
-                geo.Rect(
-                    left=active_left, bottom=active_bottom,
-                    right=gate_left, top=active_top,
-                ),
-                geo.Rect(
-                    left=gate_left, bottom =active_bottom,
-                    right=gate_right, top=active_top,
-                ),
-                geo.Rect(
-                    left=gate_right, bottom =active_bottom,
-                    right=active_right, top=active_top,
-                ),
+                (active_left, gate_bottom, gate_left, gate_top),
+                gate_coords,
+                (gate_right, gate_bottom, active_right, gate_top),
             )
         )
-        layout.add_shape(prim=active, net=portnets["sourcedrain1"], shape=mps.parts[0])
-        layout.add_shape(prim=active, net=portnets["bulk"], shape=mps.parts[1])
-        layout.add_shape(prim=active, net=portnets["sourcedrain2"], shape=mps.parts[2])
+        yield (active, "sourcedrain1", mps.parts[0])
+        yield (active, "bulk", mps.parts[1])
+        yield (active, "sourcedrain2", mps.parts[2])
 
+        # The implant enclosure around the active is the same for all implants
+        impl_rect = _rect(*active_coords, enclosure=impl_enc)
         for impl in prim.implant:
             if impl in active.implant:
-                layout.add_shape(prim=impl, shape=_rect(
-                    active_left, active_bottom, active_right, active_top,
-                    enclosure=impl_enc
-                ))
+                yield (impl, None, impl_rect)
 
         poly = prim.gate.poly
         ext = prim.computed.min_polyactive_extension
-        poly_left = gate_left
-        poly_bottom = gate_bottom - ext
-        poly_right = gate_right
-        poly_top = gate_top + ext
-        layout.add_shape(prim=poly, net=portnets["gate"], shape=geo.Rect(
-            left=poly_left, bottom=poly_bottom, right=poly_right, top=poly_top,
-        ))
+        yield (poly, "gate", _rect(*gate_coords, enclosure=(0.0, ext)))
 
         if prim.well is not None:
             enc = active.min_well_enclosure[active.well.index(prim.well)]
-            layout.add_shape(prim=prim.well, net=portnets["bulk"], shape=_rect(
-                active_left, active_bottom, active_right, active_top, enclosure=enc,
-            ))
+            yield (prim.well, "bulk", _rect(*active_coords, enclosure=enc))
 
         if prim.gate.oxide is not None:
             # TODO: Check is there is an enclosure rule from oxide around active
@@ -1832,9 +2055,7 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
             enc = getattr(
                 prim.gate, "min_gateoxide_enclosure", prp.Enclosure(self.tech.grid),
             )
-            layout.add_shape(prim=prim.gate.oxide, shape=_rect(
-                gate_left, gate_bottom, gate_right, gate_top, enclosure=enc,
-            ))
+            yield (prim.gate.oxide, None, _rect(*gate_coords, enclosure=enc))
 
         if prim.gate.inside is not None:
             # TODO: Check is there is an enclosure rule from oxide around active
@@ -1845,17 +2066,10 @@ class _PrimitiveLayouter(dsp.PrimitiveDispatcher):
                     if prim.gate.min_gateinside_enclosure is not None
                     else prp.Enclosure(self.tech.grid)
                 )
-                layout.add_shape(prim=inside, shape=_rect(
-                    gate_left, gate_bottom, gate_right, gate_top, enclosure=enc,
-                ))
+                yield (inside, None, _rect(*gate_coords, enclosure=enc))
 
         for i, impl in enumerate(prim.implant):
-            enc = gate_encs[i]
-            layout.add_shape(prim=impl, shape=_rect(
-                gate_left, gate_bottom, gate_right, gate_top, enclosure=enc,
-            ))
-
-        return layout
+            yield (impl, None, _rect(*gate_coords, enclosure=gate_encs[i]))
 
 
 class _CircuitLayouter:
@@ -1872,34 +2086,42 @@ class _CircuitLayouter:
     def tech(self):
         return self.circuit.fab.tech
 
-    def inst_layout(self, inst, *, layoutname=None, rotation="no"):
+    def _portnets(self, inst: ckt._PrimitiveInstance) -> Dict[str, net_.Net]:
+        # The nets of the circuit can be changed at any time so the port nets
+        # are looked up on each call and not cached.
+        portnets = {
+            port.name: net
+            for net in self.circuit.nets for port in net.childports
+            if port.inst == inst
+        }
+        portnames = set(inst.ports.keys())
+        portnetnames = set(portnets.keys())
+        if not (portnames == portnetnames):
+            raise ValueError(
+                f"Unconnected port(s) {portnames - portnetnames}"
+                f" for inst '{inst.name}' of primitive '{inst.prim.name}'"
+            )
+        return portnets
+
+    def inst_layout(self, inst, *,
+        layoutname: Optional[str]=None, rotation: Union[str, geo.Rotation]="no",
+    ):
         if not isinstance(inst, ckt._Instance):
             raise TypeError("inst has to be of type '_Instance'")
+        if isinstance(rotation, geo.Rotation):
+            rotation = rotation.value
         if not isinstance(rotation, str):
             raise TypeError(
                 f"rotation has to be a string, not of type {type(rotation)}",
             )
-        if rotation not in _rotations:
-            ValueError(
+        if rotation not in _rotationset:
+            raise ValueError(
                 f"rotation '{rotation}' is not one of {_rotations}"
             )
 
         if isinstance(inst, ckt._PrimitiveInstance):
-            def _portnets():
-                for net in self.circuit.nets:
-                    for port in net.childports:
-                        if (inst == port.inst):
-                            yield (port.name, net)
-            portnets = dict(_portnets())
-            portnames = set(inst.ports.keys())
-            portnetnames = set(portnets.keys())
-            if not (portnames == portnetnames):
-                raise ValueError(
-                    f"Unconnected port(s) {portnames - portnetnames}"
-                    f" for inst '{inst.name}' of primitive '{inst.prim.name}'"
-                )
             l = self.fab.new_primitivelayout(
-                prim=inst.prim, portnets=portnets,
+                prim=inst.prim, portnets=self._portnets(inst),
                 **inst.params,
             )
             if rotation != "no":
@@ -1909,13 +2131,15 @@ class _CircuitLayouter:
             # TODO: propoer checking of nets for instance
             layout = None
             if layoutname is None:
-                try:
-                    circuitname = cast(Any, inst).circuitname
+                circuitname = inst.circuitname
+                if (
+                    (circuitname is not None)
+                    and (circuitname in inst.cell.layouts.keys())
+                ):
                     layout = inst.cell.layouts[circuitname]
-                except:
-                    layout = inst.cell.layout
-                else:
                     layoutname = circuitname
+                else:
+                    layout = inst.cell.layout
             else:
                 if not isinstance(layoutname, str):
                     raise TypeError(
@@ -1955,15 +2179,18 @@ class _CircuitLayouter:
         )
 
     def place(self, object_, *,
-        x: IntFloat, y: IntFloat, layoutname: Optional[str]=None, rotation: str="no",
+        x: IntFloat, y: IntFloat, layoutname: Optional[str]=None,
+        rotation: Union[str, geo.Rotation]="no",
     ) -> _Layout:
         if not isinstance(object_, (ckt._Instance, _Layout)):
             raise TypeError("inst has to be of type '_Instance' or '_Layout'")
+        if isinstance(rotation, geo.Rotation):
+            rotation = rotation.value
         if not isinstance(rotation, str):
             raise TypeError(
                 f"rotation has to be a string, not of type {type(rotation)}",
             )
-        if rotation not in _rotations:
+        if rotation not in _rotationset:
             raise ValueError(
                 f"rotation '{rotation}' is not one of {_rotations}"
             )
@@ -1980,21 +2207,9 @@ class _CircuitLayouter:
                 raise TypeError("x and y have to be floats")
 
             if isinstance(inst, ckt._PrimitiveInstance):
-                def _portnets():
-                    for net in self.circuit.nets:
-                        for port in net.childports:
-                            if (inst == port.inst):
-                                yield (port.name, net)
-                portnets = dict(_portnets())
-                portnames = set(inst.ports.keys())
-                portnetnames = set(portnets.keys())
-                if not (portnames == portnetnames):
-                    raise ValueError(
-                        f"Unconnected port(s) {portnames - portnetnames}"
-                        f" for inst '{inst.name}' of primitive '{inst.prim.name}'"
-                    )
                 return self.layout.add_primitive(
-                    prim=inst.prim, x=x, y=y, rotation=rotation, portnets=portnets,
+                    prim=inst.prim, x=x, y=y, rotation=rotation,
+                    portnets=self._portnets(inst),
                     **inst.params,
                 )
             elif isinstance(inst, ckt._CellInstance):
@@ -2070,6 +2285,8 @@ class _CircuitLayouter:
             self.add_shape(prim=prim, net=None, shape=shape)
 
     def connect(self, *, masks=None):
+        if masks is not None:
+            masks = frozenset(masks)
         for polygon in self.layout.polygons:
             if (masks is not None) and (polygon.mask not in masks):
                 continue
@@ -2089,11 +2306,10 @@ class LayoutFactory:
         cls: Type[_Layout]=_Layout
     ):
         if sublayouts is None:
-            sublayouts = SubLayouts()
+            return cls(self, SubLayouts())
         if isinstance(sublayouts, _SubLayout):
             sublayouts = SubLayouts(sublayouts)
 
-        return _Layout(self, sublayouts)
         return cls(self, sublayouts)
 
     def new_primitivelayout(self, prim, **prim_params) -> _Layout:
@@ -2185,9 +2401,7 @@ class LayoutFactory:
                 bottom_enc = via.min_bottom_enclosure[idx]
             else:
                 spec_out["bottom_enclosure"] = bottom_enc
-            bottom_enc = bottom_enc.spec
-            if isinstance(bottom_enc, float):
-                bottom_enc = (bottom_enc, bottom_enc)
+            bottom_enc = _enclosure_xy(bottom_enc)
 
             try:
                 top_layer = bound_spec["top_layer"]
@@ -2203,9 +2417,7 @@ class LayoutFactory:
             else:
                 spec_out["top_enclosure"] = top_enc
 
-            top_enc = top_enc.spec
-            if isinstance(top_enc, float):
-                top_enc = (top_enc, top_enc)
+            top_enc = _enclosure_xy(top_enc)
 
             via_left = via_bottom = via_right = via_top = None
             if "bottom_left" in bound_spec:
@@ -2282,21 +2494,85 @@ class LayoutFactory:
         return spec_out
 
 
+def _polygon_path(polygon):
+    """Convert a shapely (Multi)Polygon in a matplotlib Path; every ring is
+    a closed sub path of the returned Path. `None` is returned for an empty
+    polygon.
+    """
+    from matplotlib.path import Path
+
+    vertices: List[Tuple[float, float]] = []
+    codes: List[int] = []
+    polygons = (
+        polygon.geoms if isinstance(polygon, sh_geo.MultiPolygon) else (polygon,)
+    )
+    for subpolygon in polygons:
+        if subpolygon.is_empty:
+            continue
+        # Exterior counter-clockwise and interiors clockwise so holes are not
+        # filled.
+        subpolygon = sh_geo.polygon.orient(subpolygon, sign=1.0)
+        for ring in (subpolygon.exterior, *subpolygon.interiors):
+            coords = tuple(ring.coords)
+            vertices.extend(coords)
+            codes.extend((
+                Path.MOVETO, *((len(coords) - 2)*(Path.LINETO,)), Path.CLOSEPOLY,
+            ))
+
+    return Path(vertices, codes) if vertices else None
+
+
 class Plotter:
+    """Plot layout polygons with matplotlib
+
+    Arguments:
+        plot_specs: draw arguments per mask name. The polygons of a mask are
+            drawn as one matplotlib PatchCollection so the arguments have to be
+            PatchCollection arguments. The Patch only argument `fill` is
+            converted to the corresponding face color; other Patch only
+            arguments raise a TypeError when plotting.
+    """
     def __init__(self, plot_specs={}):
         self.plot_specs = dict(plot_specs)
 
     def plot(self, obj):
+        # matplotlib is only imported when actually plotting so it is not loaded
+        # for code that only generates layout.
+        from matplotlib import pyplot as plt
+        from matplotlib.collections import PatchCollection
+        from matplotlib.patches import PathPatch
+
+        # First collect all polygons per mask and then add one collection per
+        # mask to the plot.
+        polygons: Dict[str, List[Any]] = defaultdict(list)
+        self._collect(obj, polygons)
+
+        ax = plt.gca()
+        for maskname, mask_polygons in polygons.items():
+            draw_args = dict(self.plot_specs.get(maskname, {}))
+            # PatchCollection does not support fill; an unfilled patch is drawn
+            # without face color.
+            if not draw_args.pop("fill", True):
+                draw_args["facecolor"] = "none"
+            for arg in draw_args:
+                if not hasattr(PatchCollection, f"set_{arg}"):
+                    raise TypeError(
+                        f"Unsupported plot argument '{arg}' for mask '{maskname}'"
+                    )
+            paths = (_polygon_path(polygon) for polygon in mask_polygons)
+            ax.add_collection(PatchCollection(
+                [PathPatch(path) for path in paths if path is not None],
+                **draw_args,
+            ))
+
+    def _collect(self, obj, polygons: Dict[str, List[Any]]):
         if _util.is_iterable(obj):
             for item in obj:
-                self.plot(item)
+                self._collect(item, polygons)
         elif isinstance(obj, (_Layout, _SubLayout)):
             for item in obj.polygons:
-                self.plot(item)
+                self._collect(item, polygons)
         elif isinstance(obj, MaskPolygon):
-            ax = plt.gca()
-            draw_args = self.plot_specs.get(obj.mask.name, {})
-            patch = descartes.PolygonPatch(obj.polygon, **draw_args)
-            ax.add_patch(patch)
+            polygons[obj.mask.name].append(obj.polygon)
         else:
             raise NotImplementedError(f"plotting obj of type '{obj.__class__.__name__}'")
@@ -775,6 +775,22 @@ class MultiPartShape(Polygon):
             for part in parts
         )
 
+    @staticmethod
+    # type: ignore[override]
+    def from_floats(*,
+        fullshape: Polygon, parts: Iterable[Tuple[float, float, float, float]],
+    ) -> "MultiPartShape":
+        """Create a MultiPartShape with rectangular parts.
+
+        Arguments:
+            fullshape: The full shape
+            parts: The (left, bottom, right, top) values of the rectangular parts.
+        """
+        return MultiPartShape(
+            fullshape=fullshape,
+            parts=(Rect.from_floats(values=values) for values in parts),
+        )
+
     @property
     def fullshape(self) -> Polygon:
         return self._fullshape
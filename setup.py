@@ -29,7 +29,7 @@ setup(
     python_requires="~=3.6",
     setup_requires=["setuptools_scm"],
     install_requires=[
-        "setuptools", "modgrammar", "shapely", "descartes",
+        "setuptools", "modgrammar", "shapely", "matplotlib",
         "c4m-PySpice~=1.4.3.post0",
     ],
     include_package_data=True,
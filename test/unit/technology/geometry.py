@@ -434,6 +434,14 @@ class GeometryTest(unittest.TestCase):
         self.assertEqual(rot * mps, mps.rotated(rotation=rot))
         self.assertEqual(part1_rotated.multipartshape, mps*rot)
 
+        mps2 = _geo.MultiPartShape.from_floats(
+            fullshape=r_all, parts=((-2.0, -1.0, 0.0, 1.0), (0.0, -1.0, 1.0, 1.0)),
+        )
+        self.assertEqual(mps2, mps)
+        self.assertEqual(
+            tuple(part.partshape for part in mps2.parts), (r_left, r_right),
+        )
+
     def test_multishape(self):
         p = _geo.Point(x=1.0, y=-1.0)
         p2 = _geo.Point(x=1.0, y=1.0)
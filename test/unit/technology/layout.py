@@ -2,13 +2,46 @@
 # type: ignore
 import unittest
 
-from pdkmaster.technology import mask as _msk, net as _net, geometry as _geo
-from pdkmaster.design import layout as _lay, circuit as _ckt
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib import pyplot as _plt
+from shapely import geometry as _sh_geo
+
+from pdkmaster.technology import (
+    mask as _msk, net as _net, geometry as _geo, property_ as _prp,
+    primitive as _prm, technology_ as _tch,
+)
+from pdkmaster.design import layout as _lay, circuit as _ckt, library as _lbry
 
 class TestNet(_net.Net):
     def __init__(self, name: str):
         super().__init__(name)
 
+class _Technology(_tch.Technology):
+    name = "test"
+    grid = 0.005
+    substrate_type = "p"
+
+    def _init(self):
+        nimpl = _prm.Implant(name="nimplant", type_="n", min_width=0.4, min_space=0.4)
+        nwell = _prm.Well(name="nwell", type_="n", min_width=1.0, min_space=1.0)
+        active = _prm.WaferWire(name="active", min_width=0.3, min_space=0.3,
+            allow_in_substrate=True, implant=nimpl,
+            min_implant_enclosure=_prp.Enclosure(0.1), implant_abut="none",
+            allow_contactless_implant=False, well=nwell,
+            min_well_enclosure=_prp.Enclosure(0.5), allow_well_crossing=False,
+        )
+        metal1 = _prm.MetalWire(name="metal1", min_width=0.25, min_space=0.25)
+        contact = _prm.Via(name="contact", bottom=active, top=metal1,
+            width=0.2, min_space=0.2,
+            min_bottom_enclosure=_prp.Enclosure(0.05),
+            min_top_enclosure=_prp.Enclosure(0.05),
+        )
+        self._primitives += (nimpl, nwell, active, contact, metal1)
+
+tech = _Technology()
+layoutfab = _lay.LayoutFactory(tech)
+
 class LayoutTest(unittest.TestCase):
     def test_maskshapessublayout(self):
         m1 = _msk.DesignMask("mask1", fill_space="no")
@@ -55,3 +88,271 @@ class LayoutTest(unittest.TestCase):
         mssl7.move(dx=p.x, dy=p.y, rotation="no")
 
         self.assertEqual(mssl6, mssl7)
+
+    def test_maskpolygons_iadd(self):
+        m1 = _msk.DesignMask("mask1", fill_space="no")
+        m2 = _msk.DesignMask("mask2", fill_space="no")
+        b1 = _sh_geo.box(0.0, 0.0, 1.0, 1.0)
+        b2 = _sh_geo.box(0.5, 0.0, 2.0, 1.0)
+        b3 = _sh_geo.box(5.0, 5.0, 6.0, 6.0)
+        b4 = _sh_geo.box(0.0, 0.0, 3.0, 3.0)
+
+        # Several polygons on same mask without existing polygon for that mask
+        mps = _lay.MaskPolygons()
+        mps += (
+            _lay.MaskPolygon(m1, b1), _lay.MaskPolygon(m2, b4),
+            _lay.MaskPolygon(m1, b2), _lay.MaskPolygon(m1, b3),
+        )
+        self.assertEqual(len(mps), 2)
+        self.assertTrue(mps[m1].polygon.equals(b1.union(b2).union(b3)))
+        self.assertTrue(mps[m2].polygon.equals(b4))
+
+        # Several polygons on same mask with existing polygon for that mask
+        mps = _lay.MaskPolygons(_lay.MaskPolygon(m1, b1))
+        mps += (_lay.MaskPolygon(m1, b2), _lay.MaskPolygon(m1, b3))
+        self.assertEqual(len(mps), 1)
+        self.assertTrue(mps[m1].polygon.equals(b1.union(b2).union(b3)))
+
+        # Add other MaskPolygons
+        mps2 = _lay.MaskPolygons((_lay.MaskPolygon(m1, b4), _lay.MaskPolygon(m2, b3)))
+        mps += mps2
+        self.assertEqual(len(mps), 2)
+        self.assertTrue(mps[m1].polygon.equals(b4.union(b3)))
+        self.assertTrue(mps[m2].polygon.equals(b3))
+
+        with self.assertRaises(TypeError):
+            mps += (_lay.MaskPolygon(m1, b1), b2)
+        self.assertTrue(mps[m1].polygon.equals(b4.union(b3)))
+
+    def test_maskpolygon_grow(self):
+        m1 = _msk.DesignMask("mask1", fill_space="no")
+        box = _sh_geo.box
+
+        def check(polygon, size, expected):
+            mp = _lay.MaskPolygon(m1, polygon)
+            grown = mp.grown(size)
+            mp.grow(size)
+            for p in (grown.polygon, mp.polygon):
+                if expected.is_empty:
+                    self.assertTrue(p.is_empty)
+                else:
+                    self.assertTrue(
+                        p.equals(expected), f"{p.wkt} != {expected.wkt}",
+                    )
+
+        # Rectangle
+        check(box(0.0, 0.0, 2.0, 1.0), 0.5, box(-0.5, -0.5, 2.5, 1.5))
+        check(box(0.0, 0.0, 2.0, 1.0), -0.25, box(0.25, 0.25, 1.75, 0.75))
+        check(box(0.0, 0.0, 2.0, 1.0), -0.5, _sh_geo.Polygon())
+
+        # L-shape
+        lshape = box(0.0, 0.0, 3.0, 1.0).union(box(0.0, 0.0, 1.0, 3.0))
+        check(
+            lshape, 0.5,
+            box(-0.5, -0.5, 3.5, 1.5).union(box(-0.5, -0.5, 1.5, 3.5)),
+        )
+        check(
+            lshape, -0.25,
+            box(0.25, 0.25, 2.75, 0.75).union(box(0.25, 0.25, 0.75, 2.75)),
+        )
+
+        # Polygon with a hole
+        holed = box(0.0, 0.0, 6.0, 6.0).difference(box(2.0, 2.0, 4.0, 4.0))
+        check(
+            holed, 0.5,
+            box(-0.5, -0.5, 6.5, 6.5).difference(box(2.5, 2.5, 3.5, 3.5)),
+        )
+        check(holed, 1.0, box(-1.0, -1.0, 7.0, 7.0))
+        check(
+            holed, -0.5,
+            box(0.5, 0.5, 5.5, 5.5).difference(box(1.5, 1.5, 4.5, 4.5)),
+        )
+
+        # MultiPolygon
+        multi = _sh_geo.MultiPolygon((box(0.0, 0.0, 1.0, 1.0), box(3.0, 0.0, 4.0, 1.0)))
+        check(
+            multi, 0.5,
+            box(-0.5, -0.5, 1.5, 1.5).union(box(2.5, -0.5, 4.5, 1.5)),
+        )
+        check(multi, 1.0, box(-1.0, -1.0, 5.0, 2.0))
+        check(
+            multi, -0.25,
+            box(0.25, 0.25, 0.75, 0.75).union(box(3.25, 0.25, 3.75, 0.75)),
+        )
+
+    def test_maskpolygons_getattr(self):
+        m1 = _msk.DesignMask("mask1", fill_space="no")
+        m2 = _msk.DesignMask("mask2", fill_space="no")
+        p1 = _lay.MaskPolygon(m1, _sh_geo.box(0.0, 0.0, 1.0, 1.0))
+        p2 = _lay.MaskPolygon(m2, _sh_geo.box(0.0, 0.0, 2.0, 2.0))
+        mps = _lay.MaskPolygons((p1, p2))
+
+        self.assertIs(mps.mask1, p1)
+        self.assertIs(mps.mask2, p2)
+        with self.assertRaises(AttributeError):
+            mps.nope
+        self.assertIsNone(getattr(mps, "nope", None))
+        self.assertFalse(hasattr(mps, "_nope_"))
+
+        # Cached lookup has to follow changes to the polygons
+        p3 = _lay.MaskPolygon(m1, _sh_geo.box(0.0, 0.0, 3.0, 3.0))
+        mps[m1] = p3
+        self.assertIs(mps.mask1, p3)
+        mps.pop(m2)
+        with self.assertRaises(AttributeError):
+            mps.mask2
+        mps += p2
+        self.assertIs(mps.mask2, p2)
+
+    def test_maskpolygon_connect(self):
+        m1 = _msk.DesignMask("mask1", fill_space="yes")
+        box = _sh_geo.box
+
+        def check(polygon, expected):
+            mp = _lay.MaskPolygon(m1, polygon)
+            connected = mp.connected()
+            mp.connect()
+            for p in (connected.polygon, mp.polygon):
+                self.assertTrue(p.equals(expected), f"{p.wkt} != {expected.wkt}")
+            return connected.polygon
+
+        # Rectangle is returned unchanged
+        rect = box(0.0, 0.0, 2.0, 1.0)
+        self.assertIs(check(rect, rect), rect)
+
+        # Convex hull is Manhattan
+        ushape = box(0.0, 0.0, 3.0, 3.0).difference(box(1.0, 1.0, 2.0, 3.0))
+        check(ushape, box(0.0, 0.0, 3.0, 3.0))
+
+        # Convex hull is not Manhattan
+        lshape = box(0.0, 0.0, 3.0, 1.0).union(box(0.0, 0.0, 1.0, 3.0))
+        check(lshape, lshape)
+        triangle = _sh_geo.Polygon(((0.0, 0.0), (2.0, 0.0), (0.0, 2.0)))
+        check(triangle, box(0.0, 0.0, 2.0, 2.0))
+
+        # Convex hull is only Manhattan after removing rounding noise
+        noisy = _sh_geo.Polygon((
+            (0.0, 0.0), (2.0, 0.0), (2.0, 1.0), (1.0, 1.0 + 1e-7), (0.0, 1.0),
+        ))
+        check(noisy, box(0.0, 0.0, 2.0, 1.0))
+
+    def test_maskpolygon_iand(self):
+        m1 = _msk.DesignMask("mask1", fill_space="no")
+        m2 = _msk.DesignMask("mask2", fill_space="no")
+        p = _lay.MaskPolygon(m1, _sh_geo.box(0.0, 0.0, 2.0, 2.0))
+        p2 = p
+        p &= _lay.MaskPolygon(m1, _sh_geo.box(1.0, 1.0, 3.0, 3.0))
+        self.assertIsInstance(p, _lay.MaskPolygon)
+        self.assertIs(p, p2)
+        self.assertTrue(p.polygon.equals(_sh_geo.box(1.0, 1.0, 2.0, 2.0)))
+
+        p &= _sh_geo.box(0.0, 0.0, 1.5, 1.5)
+        self.assertIsInstance(p, _lay.MaskPolygon)
+        self.assertAlmostEqual(p.polygon.area, 0.25)
+
+        # Nothing on the same mask
+        p &= _lay.MaskPolygon(m2, _sh_geo.box(0.0, 0.0, 2.0, 2.0))
+        self.assertIsInstance(p, _lay.MaskPolygon)
+        self.assertTrue(p.polygon.is_empty)
+
+    def test_circuitlayouter_portnets(self):
+        metal1 = tech.primitives.metal1
+        lib = _lbry.Library("lib", tech=tech, layoutfab=layoutfab)
+        cell = lib.new_cell("cell")
+        ckt = cell.new_circuit()
+        w1 = ckt.new_instance("w1", metal1, width=1.0, height=1.0)
+        w2 = ckt.new_instance("w2", metal1, width=1.0, height=1.0)
+        n1 = ckt.new_net("n1", external=False, childports=w1.ports.conn)
+        n2 = ckt.new_net("n2", external=False, childports=w2.ports.conn)
+        layouter = cell.new_circuitlayouter(boundary=None)
+
+        def nets(l):
+            return tuple(sl.net for sl in l.sublayouts)
+
+        self.assertEqual(nets(layouter.inst_layout(w1)), (n1,))
+        self.assertEqual(nets(layouter.inst_layout(w2)), (n2,))
+
+        # Swap the nets of the two instances; the number of ports on each net
+        # stays the same.
+        n1.childports.pop("w1.conn")
+        n2.childports.pop("w2.conn")
+        n1.childports += w2.ports.conn
+        n2.childports += w1.ports.conn
+
+        self.assertEqual(nets(layouter.inst_layout(w1)), (n2,))
+        self.assertEqual(nets(layouter.place(w2, x=0.0, y=0.0)), (n1,))
+
+        n1.childports.pop("w2.conn")
+        with self.assertRaises(ValueError):
+            layouter.inst_layout(w2)
+
+    def test_add_wires(self):
+        metal1 = tech.primitives.metal1
+        n1 = TestNet("net1")
+        n2 = TestNet("net2")
+        params = {"width": 1.0, "height": 0.5}
+
+        layout1 = layoutfab.new_layout()
+        ls1 = layout1.add_wires(
+            nets=(n1, n2), wire=metal1, xs=(0.0, 2.0), ys=(1.0, -1.0), **params,
+        )
+        layout2 = layoutfab.new_layout()
+        ls2 = (
+            layout2.add_wire(net=n1, wire=metal1, x=0.0, y=1.0, **params),
+            layout2.add_wire(net=n2, wire=metal1, x=2.0, y=-1.0, **params),
+        )
+
+        self.assertEqual(len(ls1), 2)
+        for l1, l2 in zip(ls1, ls2):
+            self.assertEqual(tuple(l1.sublayouts), tuple(l2.sublayouts))
+        self.assertEqual(tuple(layout1.sublayouts), tuple(layout2.sublayouts))
+
+        with self.assertRaises(ValueError):
+            layout1.add_wires(nets=(n1, n2), wire=metal1, xs=(0.0,), **params)
+        with self.assertRaises(TypeError):
+            layout1.add_wires(nets=(n1, n2), wire=metal1, x=1.0, **params)
+
+    def test_plotter(self):
+        m1 = _msk.DesignMask("mask1", fill_space="no")
+        m2 = _msk.DesignMask("mask2", fill_space="no")
+        holed = _sh_geo.Polygon(
+            shell=((0.0, 0.0), (4.0, 0.0), (4.0, 4.0), (0.0, 4.0)),
+            holes=(((1.0, 1.0), (3.0, 1.0), (3.0, 3.0), (1.0, 3.0)),),
+        )
+        mps = _lay.MaskPolygons((
+            _lay.MaskPolygon(m1, holed),
+            _lay.MaskPolygon(m2, _sh_geo.Polygon()),
+        ))
+
+        _plt.figure()
+        try:
+            _lay.Plotter({"mask1": {"fill": False, "edgecolor": "red"}}).plot(mps)
+            ax = _plt.gca()
+            coll1, coll2 = ax.collections
+        finally:
+            _plt.close()
+
+        # No face color for unfilled mask
+        self.assertTrue(all(c[3] == 0.0 for c in coll1.get_facecolor()))
+        (path,) = coll1.get_paths()
+        # Exterior and hole are both closed sub paths with opposite orientation
+        # so the hole is not filled.
+        self.assertEqual(tuple(path.codes).count(path.CLOSEPOLY), 2)
+        self.assertEqual(
+            tuple(_sh_geo.LinearRing(coords).is_ccw for coords in path.to_polygons()),
+            (True, False),
+        )
+        # Empty polygon gives empty collection
+        self.assertEqual(len(coll2.get_paths()), 0)
+
+        # Other arguments are passed on to the PatchCollection; Patch only
+        # arguments are rejected.
+        _plt.figure()
+        try:
+            _lay.Plotter({"mask1": {"lw": 2.0, "fc": "blue"}}).plot(mps)
+            coll1, _ = _plt.gca().collections
+            self.assertEqual(tuple(coll1.get_linewidth()), (2.0,))
+            with self.assertRaises(TypeError):
+                _lay.Plotter({"mask1": {"edgegapcolor": "red"}}).plot(mps)
+        finally:
+            _plt.close()